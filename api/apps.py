@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from .signals import connect_user_list_version
+        connect_user_list_version()
+
+        from .utils.jwt_hmac import install_prekeyed_hmac
+        install_prekeyed_hmac()
+
+        # Every simplejwt token resolves its backend with import_string on first use, share the resolved one instead
+        # and prepare its signing key now rather than on the first request
+        from rest_framework_simplejwt.state import token_backend
+        from rest_framework_simplejwt.tokens import Token
+        Token._token_backend = token_backend
+        token_backend.prepared_signing_key
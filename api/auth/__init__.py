@@ -0,0 +1,3 @@
+from .cached_jwt import CachedJWTAuthentication
+
+__all__ = ["CachedJWTAuthentication"]
\ No newline at end of file
@@ -0,0 +1,69 @@
+import hashlib
+import time
+from threading import Lock
+
+from cachetools import TLRUCache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import HTTP_HEADER_ENCODING
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from api.utils import JWTCache
+from api.utils.jwt_cache import CACHE_MAXSIZE, expires_at
+
+# Authenticated (user, token) pairs by access token digest.
+# A deactivated user may stay authenticated for up to jwt_cache.CACHE_TTL seconds.
+_AUTHENTICATED = TLRUCache(
+    maxsize=CACHE_MAXSIZE,
+    ttu=lambda key, authenticated, now: expires_at(key, authenticated[1], now),
+    timer=time.time,
+)
+_AUTHENTICATED_LOCK = Lock()
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    CachedJWTAuthentication is a JWTAuthentication that remembers the authenticated user of each access token.
+    Repeated requests with the same token skip both the signature verification and the user query.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        key = hashlib.blake2b(raw_token, digest_size=16).digest()
+        with _AUTHENTICATED_LOCK:
+            authenticated = _AUTHENTICATED.get(key)
+        if authenticated is not None:
+            return authenticated
+
+        validated_token = self.get_validated_token(raw_token)
+        authenticated = (self.get_user(validated_token), validated_token)
+        with _AUTHENTICATED_LOCK:
+            _AUTHENTICATED[key] = authenticated
+        return authenticated
+
+    def get_validated_token(self, raw_token: bytes):
+        """Same as JWTAuthentication.get_validated_token, with the verification going through JWTCache."""
+        # The header bytes were encoded with HTTP_HEADER_ENCODING (latin-1), decoding them back can't fail
+        token_str = raw_token.decode(HTTP_HEADER_ENCODING)
+        messages = []
+        for AuthToken in api_settings.AUTH_TOKEN_CLASSES:
+            try:
+                return JWTCache.verify(AuthToken, token_str)
+            except TokenError as e:
+                messages.append({
+                    "token_class": AuthToken.__name__,
+                    "token_type": AuthToken.token_type,
+                    "message": e.args[0],
+                })
+
+        raise InvalidToken({
+            "detail": _("Given token not valid for any token type"),
+            "messages": messages,
+        })
@@ -1,6 +1,3 @@
-from .service_injector import service_injector
-from .serializer_injector import serializer_injector
-from .route_protector import route_protector
-from .extract_refresh_token import extract_refresh_token
+from .protected_view import protected_view
 
-__all__ = ["service_injector", "serializer_injector", "route_protector", "extract_refresh_token"]
+__all__ = ["protected_view"]
@@ -0,0 +1,60 @@
+from functools import wraps
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+
+from .services import build_service
+from .tokens import verify_access_header, verify_refresh_header
+
+def protected_view(http_method_names, service_class, serializer_class=None, many=False, instance=None,
+                   authenticated=False, pass_access_token=False, refresh_token=False):
+    """
+    Wrap a view with `api_view` and inject its dependencies, in a single wrapper per request.
+    The view receives (request, service[, access_token][, serializer][, refresh_token=...]):
+    - `authenticated` requires a valid Bearer access token, `pass_access_token` also passes it to the view.
+    - `refresh_token` requires a valid refresh token in the X-Refresh-Token header.
+    - `serializer_class` is shared by GET requests, other methods get one validated against `request.data`,
+      with `instance` (or `instance(request, service[, access_token])`) as the instance to update.
+    """
+    authenticated = authenticated or pass_access_token
+
+    def decorator(view_func):
+        # Everything that doesn't depend on the request is resolved once here,
+        # services that declare `stateless = True` hold no per-request state and serve every request of the view
+        stateless = getattr(service_class, "stateless", False)
+        shared_service = build_service(service_class) if stateless else None
+        read_serializer = serializer_class(many=many) if serializer_class is not None else None
+        resolve_instance = instance if callable(instance) else None
+
+        @wraps(view_func)
+        def wrapper(request):
+            service = shared_service if stateless else build_service(service_class)
+            args = (service,)
+            kwargs = {}
+
+            if authenticated:
+                access_token = verify_access_header(request)
+                if isinstance(access_token, Response):
+                    return access_token
+                if pass_access_token:
+                    args = (service, access_token)
+
+            if refresh_token:
+                token_obj = verify_refresh_header(request)
+                if isinstance(token_obj, Response):
+                    return token_obj
+                kwargs["refresh_token"] = token_obj
+
+            if serializer_class is not None:
+                if request.method == "GET":
+                    return view_func(request, *args, read_serializer, **kwargs)
+
+                instance_obj = resolve_instance(request, *args) if resolve_instance is not None else instance
+                serializer = serializer_class(instance=instance_obj, data=request.data)
+                if not serializer.is_valid():
+                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+                return view_func(request, *args, serializer, **kwargs)
+
+            return view_func(request, *args, **kwargs)
+        return api_view(http_method_names)(wrapper)
+    return decorator
@@ -0,0 +1,5 @@
+from api.repositories import UserRepository
+
+def build_service(service_class):
+    """Return a new instance of a service class, wired to its repository."""
+    return service_class(UserRepository())
@@ -0,0 +1,37 @@
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken, TokenError
+
+from api.utils import JWTCache, VerifiedToken
+
+BEARER_PREFIX = "Bearer "
+
+def verify_access_header(request) -> VerifiedToken | Response:
+    """
+    Return the verified access token of the Authorization header, or the 401 response to send back.
+    The user id of a valid token is also set on `request.user_id`.
+    """
+    auth_header = request.META.get("HTTP_AUTHORIZATION")
+    if not auth_header or not auth_header.startswith(BEARER_PREFIX):
+        return Response({"message": "Invalid authorization header"}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    # Slice the prefix off instead of building a list with split()
+    token_str = auth_header[len(BEARER_PREFIX):]
+    try:
+        token_obj = JWTCache.verify(AccessToken, token_str)
+    except TokenError:
+        return Response({"message": "Invalid token"}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    request.user_id = token_obj.payload.get("user_id")
+    return token_obj
+
+def verify_refresh_header(request) -> VerifiedToken | Response:
+    """Return the verified refresh token of the X-Refresh-Token header, or the 400 response to send back."""
+    token_str = request.META.get("HTTP_X_REFRESH_TOKEN")
+    if not token_str:
+        return Response({"message": "Invalid refresh header"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        return JWTCache.verify(RefreshToken, token_str)
+    except TokenError:
+        return Response({"message": "Invalid refresh token"}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.hashers import CalibratedArgon2PasswordHasher
+
+
+class Command(BaseCommand):
+    help = "Measure the Argon2 time cost reaching the target hashing time on this machine, to set as ARGON2_TIME_COST."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target-ms", type=int, default=300, help="Target time of a single password hash, in milliseconds.")
+
+    def handle(self, *args, **options):
+        time_cost = CalibratedArgon2PasswordHasher.calibrate(options["target_ms"])
+        self.stdout.write(self.style.SUCCESS(f"ARGON2_TIME_COST={time_cost}"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services import RedisService
+
+
+class Command(BaseCommand):
+    help = "Delete token blacklist keys that have no expiration in Redis, meant to run nightly."
+
+    def handle(self, *args, **options):
+        result = RedisService().cleanup_blacklist()
+        if not result.is_success:
+            raise CommandError(result.error)
+
+        self.stdout.write(self.style.SUCCESS(f"Removed {result.data} blacklist keys without expiration"))
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 import uuid
 
 class User(AbstractUser):
@@ -19,6 +20,16 @@ class User(AbstractUser):
         db_table = 'users'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        constraints = [
+            models.UniqueConstraint(Lower("email"), name="user_email_lower_idx"),
+        ]
+        indexes = [
+            # Serves the user list, ordered by signup time with the id as tie-breaker
+            models.Index(fields=["created_at", "id"], name="user_created_at_id_idx"),
+        ]
     
     def __str__(self):
-        return self.id
\ No newline at end of file
+        return self.id
+
+# Enables `email__lower=` lookups on this field only, matched by the functional index above
+User._meta.get_field("email").register_lookup(Lower)
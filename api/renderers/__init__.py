@@ -0,0 +1,3 @@
+from .orjson_renderer import OrjsonRenderer
+
+__all__ = ["OrjsonRenderer"]
@@ -1,9 +1,14 @@
 from django.db.models import QuerySet
+from django.dispatch import Signal
+from django.utils import timezone
 from typing import Type, TypeVar, Optional, Generic
 from ..models import User
 
 T = TypeVar('T', bound=User)
 
+# QuerySet.update() sends neither pre_save nor post_save, update_by_id sends this one once the rows are written
+post_update = Signal()
+
 class BaseRepository(Generic[T]):
 
     def __init__(self, model: Type[T]):
@@ -12,11 +17,16 @@ class BaseRepository(Generic[T]):
     def create(self, **kwargs) -> T:
         return self.model.objects.create(**kwargs)
     
-    def update(self, instance: T, **kwargs) -> T:
-        for key, value in kwargs.items():
-            setattr(instance, key, value)
-        instance.save()
-        return instance
+    def update_by_id(self, id: str, **kwargs) -> int:
+        """Write the given columns of a row by primary key without loading it, return the number of rows updated."""
+        # QuerySet.update() doesn't touch auto_now fields, stamp them here like save() would
+        now = timezone.now()
+        for field in self._auto_now_fields():
+            kwargs.setdefault(field, now)
+        updated = self.model.objects.filter(pk=id).update(**kwargs)
+        if updated:
+            post_update.send(sender=self.model, pk=id, fields=list(kwargs))
+        return updated
     
     def delete(self, instance: T) -> None:
         instance.delete()
@@ -37,4 +47,7 @@ class BaseRepository(Generic[T]):
         return self.model.objects.filter(**kwargs).count()
     
     def all(self) -> QuerySet[T]:
-        return self.model.objects.all()
\ No newline at end of file
+        return self.model.objects.all()
+    
+    def _auto_now_fields(self) -> list[str]:
+        return [field.name for field in self.model._meta.concrete_fields if getattr(field, "auto_now", False)]
\ No newline at end of file
@@ -1,3 +1,6 @@
+from django.db import IntegrityError, transaction
+from django.db.models import QuerySet
+from rest_framework import serializers
 from typing import Optional
 from .base_repository import BaseRepository
 from ..models import User
@@ -11,15 +14,40 @@ class UserRepository(BaseRepository[User]):
     def create_user(self, user_data: dict) -> User:
         if "password" in user_data:
             user_data["password"] = PasswordUtils.hash_password(user_data["password"])
-        return self.create(**user_data)
+        # Rely on the unique constraints instead of checking beforehand, a savepoint keeps any outer transaction usable
+        try:
+            with transaction.atomic():
+                return self.create(**user_data)
+        except IntegrityError as e:
+            raise serializers.ValidationError(self._parse_integrity_error(e))
     
-    def update_user(self, user: User, user_data: dict) -> User:
+    def update_user_by_id(self, user_id: str, user_data: dict) -> bool:
+        """Update a user with a single UPDATE statement, return False if no user has the given id."""
         if "password" in user_data:
             user_data["password"] = PasswordUtils.hash_password(user_data["password"])
-        return self.update(user, **user_data)
+        return self.update_by_id(user_id, **user_data) > 0
     
     def get_user_by_email(self, email: str) -> Optional[User]:
-        return self.filter(email=email).first()
+        return self.model.objects.only("id", "email", "username", "password", "is_active").filter(email__lower=email.lower()).first()
+    
+    def list_users(self, limit: int, offset: int) -> QuerySet[User]:
+        """Return one page of users, ordered by signup time and without the password column."""
+        # The primary key is a random UUID, ordering by it alone would insert new users at arbitrary offsets
+        return (
+            self.model.objects
+            .only("id", "email", "username", "created_at", "updated_at", "is_active")
+            .order_by("created_at", "id")[offset:offset + limit]
+        )
     
     def verify_password(self, user: User, password: str) -> bool:
-        return PasswordUtils.verify_password(password, user.password)
\ No newline at end of file
+        return PasswordUtils.verify_password(password, user.password)
+    
+    def _parse_integrity_error(self, error: IntegrityError) -> dict:
+        """Map a unique constraint violation to the serializer error of the matching field."""
+        # Drop the offending value (Postgres "Key (column)=(value)") so it can't be mistaken for a column name
+        message = str(error).split("=(", 1)[0]
+        if "email" in message:
+            return {"email": ["Email already exists"]}
+        if "username" in message:
+            return {"username": ["Username already exists"]}
+        return {"non_field_errors": ["User already exists"]}
\ No newline at end of file
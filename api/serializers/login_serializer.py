@@ -1,28 +1,38 @@
+import hashlib
+from threading import Lock
+
+from cachetools import TTLCache
 from rest_framework import serializers
-from ..models import User
+from ..repositories import UserRepository
 from ..utils import PasswordUtils
 
+# Recently rejected credentials, repeated wrong guesses are refused without running the password hasher again.
+# The stored hash is part of the key so that a password change invalidates the entries of that user.
+_REJECTED_CREDENTIALS = TTLCache(maxsize=50000, ttl=30)
+_REJECTED_CREDENTIALS_LOCK = Lock()
+
 class LoginSerializer(serializers.Serializer):
 
     email = serializers.EmailField(required=True)
     password = serializers.CharField(required=True, write_only=True)
 
-    def validate_email(self, value: str) -> str:
-        if not User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("User not found")
-        return value
-    
     def validate(self, data: dict) -> dict:
-        email = data.get("email")
+        email = data.get("email").lower()
         password = data.get("password")
-        print(email, password)
 
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("User not found")
-        
-        if not PasswordUtils.verify_password(password, user.password):
+        # Single query, loading only the columns needed by the login flow
+        user = UserRepository().get_user_by_email(email)
+
+        # An unknown email goes through the same path as a wrong password: check_password runs a dummy hash
+        # for the empty one, and its rejections are cached too, so the timing doesn't tell which emails exist
+        stored_hash = user.password if user is not None else ""
+        key = hashlib.sha256(f"{email}\0{password}\0{stored_hash}".encode()).digest()
+        with _REJECTED_CREDENTIALS_LOCK:
+            rejected = key in _REJECTED_CREDENTIALS
+
+        if rejected or not PasswordUtils.verify_password(password, stored_hash):
+            with _REJECTED_CREDENTIALS_LOCK:
+                _REJECTED_CREDENTIALS[key] = True
             raise serializers.ValidationError("User not found")
         
         data["user"] = user
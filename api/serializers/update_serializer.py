@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from ..models import User
 from ..utils import PasswordUtils
+from .user_serializer import validate_password_strength, validate_username_format
 
 class UpdateSerializer(serializers.Serializer):
     username = serializers.CharField(required=False)
@@ -8,21 +9,14 @@ class UpdateSerializer(serializers.Serializer):
     password = serializers.CharField(required=False)
     confirm_password = serializers.CharField(required=False)
 
+    # Set by validate_password when the submitted password matches the stored hash
+    password_unchanged = False
+
     def validate_username(self, value: str) -> str:
         if not value or (self.instance and self.instance.username == value):
             return value
         
-        if len(value) < 3:
-            raise serializers.ValidationError("Username must be at least 3 characters long")
-
-        if len(value) > 30:
-            raise serializers.ValidationError("Username must be less than 30 characters long")
-
-        if not value.isalnum():
-            raise serializers.ValidationError("Username must be alphanumeric")
-
-        if value.lower() == "admin":
-            raise serializers.ValidationError("Username cannot be 'admin'")
+        validate_username_format(value)
 
         if User.objects.filter(username=value).exists():
             raise serializers.ValidationError("Username already exists")
@@ -30,23 +24,31 @@ class UpdateSerializer(serializers.Serializer):
         return value
     
     def validate_email(self, value: str) -> str:
-        if not value or (self.instance and self.instance.email == value):
+        if not value:
+            return value
+
+        value = value.lower()
+        if self.instance and self.instance.email.lower() == value:
             return value
         
-        if User.objects.filter(email=value).exists():
+        if User.objects.filter(email__lower=value).exists():
             raise serializers.ValidationError("Email already exists")
         
         return value
     
     def validate_password(self, value: str) -> str:
-        if not value or (self.instance and PasswordUtils.verify_password(value, self.instance.password)):
+        if not value:
             return value
-        
-        is_strong, errors = PasswordUtils.is_password_strong(value)
-        if not is_strong:
-            raise serializers.ValidationError(errors)
 
-        return value
+        # The strength check is cheap, only pay for a hash verification when it fails
+        try:
+            return validate_password_strength(value)
+        except serializers.ValidationError:
+            # A weak password is still accepted when it is the current one
+            if self.instance and PasswordUtils.verify_password(value, self.instance.password):
+                self.password_unchanged = True
+                return value
+            raise
     
     def validate(self, attrs: dict) -> dict:
         password = attrs.get("password")
@@ -61,4 +63,9 @@ class UpdateSerializer(serializers.Serializer):
         if password and confirm_password and password != confirm_password:
             raise serializers.ValidationError("Passwords do not match")
         
+        # Known to be the current password, leave it out so it isn't hashed and written again
+        if self.password_unchanged:
+            attrs.pop("password", None)
+            attrs.pop("confirm_password", None)
+        
         return attrs
\ No newline at end of file
@@ -1,43 +1,53 @@
+import re
 from rest_framework import serializers
 from ..models import User
 from ..utils import PasswordUtils
 
+# 3 to 30 letters or digits
+USERNAME_RE = re.compile(r"[^\W_]{3,30}")
+
+def validate_username_format(value: str) -> str:
+    """Check the length, charset and reserved name rules of a username, shared by the create and update serializers."""
+    # One regex pass covers the length and alphanumeric rules, the length is only checked again to pick the message
+    if USERNAME_RE.fullmatch(value) is None:
+        if len(value) < 3:
+            raise serializers.ValidationError("Username must be at least 3 characters long")
+
+        if len(value) > 30:
+            raise serializers.ValidationError("Username must be less than 30 characters long")
+
+        raise serializers.ValidationError("Username must be alphanumeric")
+
+    if value.casefold() == "admin":
+        raise serializers.ValidationError("Username cannot be 'admin'")
+
+    return value
+
+def validate_password_strength(value: str) -> str:
+    """Check the strength rules of a password, shared by the create and update serializers."""
+    if PasswordUtils.is_password_strong_fast(value):
+        return value
+    # Only a rejected password needs the detailed messages
+    _, errors = PasswordUtils.is_password_strong(value)
+    raise serializers.ValidationError(errors)
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "email", "username", "password", "created_at", "updated_at", "is_active"]
         read_only_fields = ["id", "created_at", "updated_at", "is_active"]
+        # Uniqueness is enforced by the database constraints, see UserRepository.create_user
         extra_kwargs = {
-            "password": {"write_only": True}
+            "password": {"write_only": True},
+            "email": {"validators": []},
+            "username": {"validators": []},
         }
 
     def validate_email(self, value: str) -> str:
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Email already exists")
-        return value
+        return value.lower()
     
     def validate_password(self, value: str) -> str:
-        is_strong, errors = PasswordUtils.is_password_strong(value)
-        if not is_strong:
-            raise serializers.ValidationError(errors)
-        return value
+        return validate_password_strength(value)
     
     def validate_username(self, value: str) -> str:
-
-        if len(value) < 3:
-            raise serializers.ValidationError("Username must be at least 3 characters long")
-
-        if len(value) > 30:
-            raise serializers.ValidationError("Username must be less than 30 characters long")
-
-        if not value.isalnum():
-            raise serializers.ValidationError("Username must be alphanumeric")
-
-        if value.lower() == "admin":
-            raise serializers.ValidationError("Username cannot be 'admin'")
-
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("Username already exists")
-            
-        return value
-   
\ No newline at end of file
+        return validate_username_format(value)
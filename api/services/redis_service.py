@@ -1,45 +1,79 @@
+from cachetools import TLRUCache
 from django.core.cache import cache
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
 from typing import Dict, Any
 import json
 import logging
 import time
+from threading import Lock
 
-from ..utils import Result
+from ..utils import Result, JWTCache
 
 logger = logging.getLogger(__name__)
 
+# JTIs this process has blacklisted, each kept until its token expires.
+# Only a hit can be trusted, other processes blacklist tokens too, so a miss still goes to Redis.
+_LOCAL_BLACKLIST = TLRUCache(maxsize=10000, ttu=lambda jti, exp_timestamp, now: exp_timestamp, timer=time.time)
+_LOCAL_BLACKLIST_LOCK = Lock()
+
+# No refresh token outlives this, so neither does its blacklist entry
+MAX_BLACKLIST_TTL = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
 class RedisService:
 
     def __init__(self):
         self.cache = cache
         self.blacklist_prefix = "jwt_blacklist:"
         self.user_sessions_prefix = "user_sessions:"
+        self.user_list_version_key = "user_list_version"
 
     def blacklist_token(self, token: str) -> Result[bool] | Result[str]:
         """
         Blacklists a token.
         """
         try:
-            jti = self._get_jti_from_token(token)
-            if not jti:
+            entry = self._blacklist_entry(token)
+            if entry is None:
                 return Result.error("Invalid token format")
-            
-            exp_timestamp = self._get_exp_from_token(token)
-            if not exp_timestamp:
+            key, jti, exp_timestamp, timeout = entry
+
+            self.cache.set(key, "blacklisted", timeout=timeout)
+            with _LOCAL_BLACKLIST_LOCK:
+                _LOCAL_BLACKLIST[jti] = exp_timestamp
+            logger.info("Blacklisted refresh token by JTI: %s", jti)
+            return Result.success(True)
+
+        except Exception as e:
+            logger.error("Error blacklisting refresh token by JTI: %s", e)
+            return Result.error(f"Error blacklisting refresh token: {str(e)}")
+
+    def try_blacklist(self, token: str) -> Result[bool] | Result[str]:
+        """
+        Blacklists a token unless it already is, in a single SET NX.
+        Returns True if this call blacklisted the token, False if it was already blacklisted.
+        """
+        try:
+            entry = self._blacklist_entry(token)
+            if entry is None:
                 return Result.error("Invalid token format")
-            
-            current_time = int(time.time())
-            remaining_time = max(exp_timestamp - current_time, 0)
+            key, jti, exp_timestamp, timeout = entry
+
+            with _LOCAL_BLACKLIST_LOCK:
+                if jti in _LOCAL_BLACKLIST:
+                    return Result.success(False)
+
+            if not self.cache.add(key, "blacklisted", timeout=timeout):
+                return Result.success(False)
 
-            key = f"{self.blacklist_prefix}{jti}"
-            self.cache.set(key, "blacklisted", timeout=remaining_time)
-            logger.info(f"Blacklisted refresh token by JTI: {jti}")
+            with _LOCAL_BLACKLIST_LOCK:
+                _LOCAL_BLACKLIST[jti] = exp_timestamp
+            logger.info("Blacklisted refresh token by JTI: %s", jti)
             return Result.success(True)
 
         except Exception as e:
-            logger.error(f"Error blacklisting refresh token by JTI: {str(e)}")
+            logger.error("Error blacklisting refresh token by JTI: %s", e)
             return Result.error(f"Error blacklisting refresh token: {str(e)}")
 
     def is_token_blacklisted(self, token: str) -> Result[bool] | Result[str]:
@@ -47,36 +81,79 @@ class RedisService:
         Checks if a token is blacklisted.
         """
         try:
-            jti = self._get_jti_from_token(token)
-            if not jti:
+            entry = self._blacklist_entry(token)
+            if entry is None:
                 return Result.error("Invalid token format")
-            
-            key = f"{self.blacklist_prefix}{jti}"
+            key, jti, _, _ = entry
+
+            with _LOCAL_BLACKLIST_LOCK:
+                if jti in _LOCAL_BLACKLIST:
+                    return Result.success(True)
+
             is_blacklisted = self.cache.get(key) is not None
             
             return Result.success(is_blacklisted)
         except Exception as e:
-            logger.error(f"Error checking token blacklist status: {str(e)}")
+            logger.error("Error checking token blacklist status: %s", e)
             return Result.error(f"Error checking token blacklist status: {str(e)}")
     
-    def _get_jti_from_token(self, token: str) -> str | None:
+    def cleanup_blacklist(self) -> Result[int] | Result[str]:
+        """
+        Deletes blacklist keys left without an expiration, returns how many were removed.
+        """
+        try:
+            # SCAN in batches rather than KEYS, so Redis isn't blocked while walking the keyspace
+            stale_keys = [
+                key for key in self.cache.iter_keys(f"{self.blacklist_prefix}*", itersize=500)
+                if self.cache.ttl(key) is None
+            ]
+            if stale_keys:
+                self.cache.delete_many(stale_keys)
+            logger.info("Removed %s blacklist keys without expiration", len(stale_keys))
+            return Result.success(len(stale_keys))
+        except Exception as e:
+            logger.error("Error cleaning up token blacklist: %s", e)
+            return Result.error(f"Error cleaning up token blacklist: {str(e)}")
+    
+    def get_user_list_version(self) -> Result[int] | Result[str]:
+        """
+        Gets the version of the user list, which changes whenever a user is written or deleted.
+        """
         try:
-            token_obj = RefreshToken(token)
-            return token_obj.payload.get("jti")
-        except TokenError:
-            logger.error(f"Invalid token format: {token[:20]}...")
-            return None
+            # Seeded with the current time, so a version evicted from the cache never comes back with a value already handed out
+            version = self.cache.get_or_set(self.user_list_version_key, time.time_ns, timeout=None)
+            return Result.success(version)
         except Exception as e:
-            logger.error(f"Error getting JTI from token: {str(e)}")
-            return None
-        
-    def _get_exp_from_token(self, token: str) -> int | None:
+            logger.error("Error getting user list version: %s", e)
+            return Result.error(f"Error getting user list version: {str(e)}")
+
+    def bump_user_list_version(self) -> Result[bool] | Result[str]:
+        """
+        Changes the version of the user list.
+        """
+        try:
+            self.cache.incr(self.user_list_version_key)
+            return Result.success(True)
+        except ValueError:
+            # Not cached, the next read seeds a version newer than any previous one
+            return Result.success(True)
+        except Exception as e:
+            logger.error("Error bumping user list version: %s", e)
+            return Result.error(f"Error bumping user list version: {str(e)}")
+    
+    def _blacklist_entry(self, token: str) -> tuple[str, str, int, int] | None:
+        """Return the (key, jti, exp, timeout) of a token blacklist entry, or None if the token is invalid."""
         try:
-            token_obj = RefreshToken(token)
-            return token_obj.payload.get("exp", 0)
+            payload = JWTCache.verify(RefreshToken, token).payload
         except TokenError:
-            logger.error(f"Invalid token format: {token[:20]}...")
+            logger.error("Invalid token format: %s...", token[:20])
             return None
-        except Exception as e:
-            logger.error(f"Error getting expiration from token: {str(e)}")
-            return None
\ No newline at end of file
+
+        jti = payload.get("jti")
+        if not jti:
+            return None
+
+        current_time = int(time.time())
+        exp_timestamp = payload.get("exp") or current_time + MAX_BLACKLIST_TTL
+        timeout = min(max(exp_timestamp - current_time, 0), MAX_BLACKLIST_TTL)
+        return f"{self.blacklist_prefix}{jti}", jti, exp_timestamp, timeout
@@ -1,27 +1,36 @@
 from django.db.models import QuerySet
-from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
+from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
-from datetime import datetime
 import logging
 
 from api.repositories import UserRepository
 from ..models import User
 from .redis_service import RedisService
-from api.utils import Result, PasswordUtils
+from api.utils import Result, ErrorCode, VerifiedToken
 
 logger = logging.getLogger(__name__)
 
+# RedisService only wraps the shared Django cache client, one instance serves every UserService
+_REDIS_SERVICE = RedisService()
+
 class UserService:
 
+    # Keeps no per-request state, protected_view builds one instance per view instead of one per request
+    stateless = True
+
     def __init__(self, repo: UserRepository):
         self.repo = repo
-        self.redis_service = RedisService()
+        self.redis_service = _REDIS_SERVICE
+    
+    def get_user_list(self, limit: int, offset: int = 0) -> Result[QuerySet[User]]:
+        # An empty page is a valid response, the queryset is only evaluated once by the serializer
+        return Result.success(self.repo.list_users(limit, offset))
     
-    def get_user_list(self) -> Result[QuerySet[User]] | Result[str]:
-        users = self.repo.all()
-        if not users:
-            return Result.error("No users found")
-        return Result.success(users)
+    def get_user_list_version(self) -> Result[int] | Result[str]:
+        """
+        Get the version of the user list, it changes whenever a row of the users table is written
+        """
+        return self.redis_service.get_user_list_version()
     
     def account_create(self, data: dict) -> Result[User] | Result[str]:
         user = self.repo.create_user(data)
@@ -38,7 +47,7 @@ class UserService:
         access_token = str(refresh.access_token)
         refresh_token = str(refresh)
         
-        logger.info(f"Login successful for user {user.username} with Redis")
+        logger.info("Login successful for user %s", user.username)
         
         return Result.success({
             "access_token" : access_token,
@@ -50,24 +59,26 @@ class UserService:
             }
         })
     
-    def refresh_token(self, refresh_token: RefreshToken) -> Result[dict] | Result[str] :
+    def refresh_token(self, refresh_token: VerifiedToken) -> Result[dict] | Result[str] :
         """
         Refresh access token using refresh token
         """
         try:
-            logger.info(f"Starting refresh token process for token: {str(refresh_token)[:20]}...")
-            
-            # First check if the token is already blacklisted
-            blacklist_check = self.redis_service.is_token_blacklisted(str(refresh_token))
-            logger.info(f"Blacklist check result: {blacklist_check}")
+            token_str = str(refresh_token)
+            logger.debug("Starting refresh token process for token: %s...", token_str[:20])
             
-            if blacklist_check.is_success and blacklist_check.data:
-                logger.warning(f"Refresh token already blacklisted")
-                return Result.error("Refresh token has been revoked")
+            # Blacklist the old token up front, a single SET NX both checks and revokes it
+            blacklist_result = self.redis_service.try_blacklist(token_str)
+            logger.debug("Blacklist result: %s", blacklist_result)
             
-            logger.info("Token not blacklisted, proceeding with refresh...")
+            if blacklist_result.is_success and not blacklist_result.data:
+                logger.warning("Refresh token already blacklisted")
+                return Result.error("Refresh token has been revoked", code=ErrorCode.REVOKED)
             
             user_id = refresh_token.payload.get("user_id")
+            if not blacklist_result.is_success:
+                logger.warning("Failed to blacklist old refresh token for user %s", user_id)
+            
             if not user_id:
                 return Result.error("Invalid refresh token")
             user = self.repo.get_by_id(user_id)
@@ -78,12 +89,7 @@ class UserService:
             new_access_token = str(refresh.access_token)
             new_refresh_token = str(refresh)
             
-            # INVALIDATE the old refresh token in Redis
-            old_refresh_blacklist = self.redis_service.blacklist_token(str(refresh_token))
-            if not old_refresh_blacklist.is_success:
-                logger.warning(f"Failed to blacklist old refresh token for user {user_id}")
-            
-            logger.info(f"Token refreshed successfully for user {user_id}")
+            logger.info("Token refreshed successfully for user %s", user_id)
             
             return Result.success({
                 "access_token" : new_access_token,
@@ -94,7 +100,7 @@ class UserService:
         except Exception as e:
             return Result.error(f"Failed to refresh token: {str(e)}")
     
-    def logout(self, refresh_token: RefreshToken, access_token: AccessToken) -> Result[bool] | Result[str] :
+    def logout(self, refresh_token: VerifiedToken, access_token: VerifiedToken) -> Result[bool] | Result[str] :
         """
         Logout user and blacklist refresh token
         """
@@ -114,17 +120,8 @@ class UserService:
         except Exception as e:
            return Result.error(f"Failed to logout user: {str(e)}")
 
-    def update_user(self, data: dict, user_id: str) -> Result[User] | Result[str]:
-        user = self.repo.get_by_id(user_id)
-        if not user:
+    def update_user(self, data: dict, user_id: str) -> Result[bool] | Result[str]:
+        user_data = {key: data[key] for key in ("username", "email", "password") if data.get(key)}
+        if not self.repo.update_user_by_id(user_id, user_data):
             return Result.error("User not found")
-
-        user.username = data.get("username", user.username)
-        user.email = data.get("email", user.email)
-        if data.get("password"):
-            user.password = PasswordUtils.hash_password(data.get("password"))
-
-
-        user.updated_at = datetime.now()
-        user.save()
-        return Result.success(user)
\ No newline at end of file
+        return Result.success(True)
\ No newline at end of file
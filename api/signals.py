@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+
+from .models import User
+from .repositories.base_repository import post_update
+from .services import RedisService
+
+
+def bump_user_list_version(sender, **kwargs):
+    """Change the user list version on every write to the users table, whichever code path made it."""
+    RedisService().bump_user_list_version()
+
+
+def connect_user_list_version():
+    for signal in (post_save, post_delete, post_update):
+        signal.connect(bump_user_list_version, sender=User)
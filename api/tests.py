@@ -1,55 +1,38 @@
-from django.test import TestCase, TransactionTestCase
+from django.test import TestCase
 from django.urls import reverse
-from django.db import connection
 from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from django.contrib.auth import get_user_model
 from unittest.mock import patch, MagicMock
 import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
 
 from api.models import User
+from api.renderers import OrjsonRenderer
+from api.repositories import UserRepository
 from api.services import UserService
-from api.utils import Result
+from api.utils import Result, PasswordUtils
 
-class DockerTestDatabaseTestCase(TransactionTestCase):
-    """Base class for database tests that use Dockerized PostgreSQL."""
-
-    def setUp(self):
-        super().setUp()
-        self._clean_db()
-
-    def tearDown(self):
-        self._clean_db()
-        super().tearDown()
-    
-    def _clean_db(self):
-        """Clean the database by dropping all tables."""
-        with connection.cursor() as cursor:
-            cursor.execute("SET session_replication_role = 'replica';")
-
-            cursor.execute("""
-                    SELECT tablename FROM pg_tables
-                    WHERE schemaname = 'public'
-                    AND tablename != 'django_migrations';
-            """)
-
-            tables = cursor.fetchall()
-
-            for table in tables:
-                table_name = table[0]
-                cursor.execute(f'TRUNCATE TABLE "{table_name}" CASCADE;')
-            
-            cursor.execute("SET session_replication_role = 'origin';")
-
-
-class UserAPITest(DockerTestDatabaseTestCase, APITestCase):
+class UserAPITest(APITestCase):
     """Test cases for the User API."""
 
+    @classmethod
+    def setUpTestData(cls):
+        # Hashing is the slow part of creating a user, do it once for the whole class
+        cls.user = User.objects.create(
+            email="test@example.com",
+            username="testuser",
+            password=PasswordUtils.hash_password("StrongPassword123!"),
+        )
+
     def setUp(self):
         self.client = APIClient()
         self.create_user_data = {
-            "email": "test@example.com",
-            "username": "testuser",
+            "email": "new@example.com",
+            "username": "newuser",
             "password": "StrongPassword123!"
         }
         self.login_user_data = {
@@ -70,15 +53,11 @@ class UserAPITest(DockerTestDatabaseTestCase, APITestCase):
         self.assertNotIn("password", response.data)
 
         user_count = User.objects.count()
-        self.assertEqual(user_count, 1)
+        self.assertEqual(user_count, 2)
     
     def test_login_user(self):
         """Test logging in a user."""
 
-        url_create = reverse("account-create")
-        create_response = self.client.post(url_create, self.create_user_data, format="json")
-        self.assertEqual(create_response.status_code, status.HTTP_201_CREATED)
-
         url_login = reverse("login")
 
         # Wrong data test
@@ -89,18 +68,150 @@ class UserAPITest(DockerTestDatabaseTestCase, APITestCase):
         wrong_login_response = self.client.post(url_login, wrong_data, format="json")
         self.assertEqual(wrong_login_response.status_code, status.HTTP_400_BAD_REQUEST)
 
+        # Unknown email test, same response as a wrong password
+        unknown_data = {
+            "email": "unknown@example.com",
+            "password": "WrongPassword123!"
+        }
+        unknown_login_response = self.client.post(url_login, unknown_data, format="json")
+        self.assertEqual(unknown_login_response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(unknown_login_response.data, wrong_login_response.data)
+
         # Correct data test
         correct_login_response = self.client.post(url_login, self.login_user_data, format="json")
         self.assertEqual(correct_login_response.status_code, status.HTTP_200_OK)
         self.assertIn("access_token", correct_login_response.data)
         self.assertIn("refresh_token", correct_login_response.data)
     
-    def test_refresh_token(self):
-        """Test refreshing a token."""
-        
+    def test_create_duplicate_user(self):
+        """Test that the unique constraints are reported as field errors."""
+
+        url = reverse("account-create")
+
+        duplicate_username_data = {**self.create_user_data, "username": self.user.username}
+        response = self.client.post(url, duplicate_username_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("username", response.data)
+
+        duplicate_email_data = {**self.create_user_data, "email": self.user.email}
+        response = self.client.post(url, duplicate_email_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.data)
+
+        self.assertEqual(User.objects.count(), 1)
+    
+    def test_email_is_case_insensitive(self):
+        """Test that emails differing only by case are the same account."""
+
         url_create = reverse("account-create")
-        create_response = self.client.post(url_create, self.create_user_data, format="json")
+
+        # Same email with a different case can't be registered again
+        duplicate_data = {
+            "email": "Test@Example.com",
+            "username": "testuser2",
+            "password": "StrongPassword123!"
+        }
+        duplicate_response = self.client.post(url_create, duplicate_data, format="json")
+        self.assertEqual(duplicate_response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Login matches the email regardless of case
+        url_login = reverse("login")
+        login_data = {
+            "email": "TEST@example.com",
+            "password": "StrongPassword123!"
+        }
+        login_response = self.client.post(url_login, login_data, format="json")
+        self.assertEqual(login_response.status_code, status.HTTP_200_OK)
+
+    def test_user_list(self):
+        """Test listing users, including an empty page."""
+
+        url = reverse("user-list")
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["username"], self.user.username)
+        self.assertNotIn("password", response.data[0])
+
+        # A page past the last user is empty, not an error
+        response = self.client.get(url, {"offset": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_user_list_etag(self):
+        """Test that an unchanged user list is answered with 304 until a user is created."""
+
+        url = reverse("user-list")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        not_modified_response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified_response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        create_response = self.client.post(reverse("account-create"), self.create_user_data, format="json")
         self.assertEqual(create_response.status_code, status.HTTP_201_CREATED)
+
+        modified_response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(modified_response.status_code, status.HTTP_200_OK)
+        self.assertEqual([user["username"] for user in modified_response.data], ["testuser", "newuser"])
+        self.assertNotEqual(modified_response["ETag"], etag)
+
+    def test_user_list_etag_outside_the_api(self):
+        """Test that writes made outside the API views, like the admin or a shell, change the ETag too."""
+
+        url = reverse("user-list")
+        etag = self.client.get(url)["ETag"]
+
+        UserRepository().update_user_by_id(self.user.pk, {"username": "renamed"})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        self.user.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_user_list_etag_per_representation(self):
+        """Test that the JSON and browsable API renderings get different ETags, and errors get none."""
+
+        url = reverse("user-list")
+        json_response = self.client.get(url, HTTP_ACCEPT="application/json")
+        html_response = self.client.get(url, HTTP_ACCEPT="text/html")
+        self.assertEqual(json_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(html_response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(json_response["ETag"], html_response["ETag"])
+        self.assertIn("Accept", json_response["Vary"])
+
+        # The HTML tag doesn't validate the JSON representation
+        response = self.client.get(url, HTTP_ACCEPT="application/json", HTTP_IF_NONE_MATCH=html_response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        error_response = self.client.get(url, {"limit": "abc"})
+        self.assertEqual(error_response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(error_response.has_header("ETag"))
+    
+    def test_non_utf8_bearer_token(self):
+        """Test that a bearer token that isn't valid UTF-8 is rejected with 401, not a server error."""
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer \xe9abc")
+
+        list_response = self.client.get(reverse("user-list"))
+        self.assertEqual(list_response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        login_response = self.client.post(reverse("login"), self.login_user_data, format="json")
+        self.assertEqual(login_response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_token(self):
+        """Test refreshing a token."""
         
         url_login = reverse("login")
         login_response = self.client.post(url_login, self.login_user_data, format="json")
@@ -150,10 +261,6 @@ class UserAPITest(DockerTestDatabaseTestCase, APITestCase):
     def test_logout(self):
         """Test logging out a user."""
         
-        url_create = reverse("account-create")
-        create_response = self.client.post(url_create, self.create_user_data, format="json")
-        self.assertEqual(create_response.status_code, status.HTTP_201_CREATED)
-        
         url_login = reverse("login")
         login_response = self.client.post(url_login, self.login_user_data, format="json")
         self.assertEqual(login_response.status_code, status.HTTP_200_OK)
@@ -182,10 +289,6 @@ class UserAPITest(DockerTestDatabaseTestCase, APITestCase):
     def test_update_user(self):
         """Test updating a user."""
 
-        url_create = reverse("account-create")
-        create_response = self.client.post(url_create, self.create_user_data, format="json")
-        self.assertEqual(create_response.status_code, status.HTTP_201_CREATED)
-
         url_login = reverse("login")
         login_response = self.client.post(url_login, self.login_user_data, format="json")
         self.assertEqual(login_response.status_code, status.HTTP_200_OK)
@@ -231,4 +334,27 @@ class UserAPITest(DockerTestDatabaseTestCase, APITestCase):
             "confirm_password": "StrongPassword123!?"
         }
         update_response = self.client.put(update_url, update_data_with_confirm_password_without_password, format="json")
-        self.assertEqual(update_response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(update_response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OrjsonRendererTest(TestCase):
+    """Test cases for the orjson renderer."""
+
+    def test_matches_json_renderer(self):
+        """Test that the output is the same as DRF's JSONRenderer."""
+
+        data = {
+            "id": uuid.uuid4(),
+            "created_at": datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            "updated_at": datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone(timedelta(hours=2))),
+            "naive": datetime(2025, 1, 2, 3, 4, 5, 678901),
+            "day": date(2025, 1, 2),
+            "at": time(3, 4, 5, 678901),
+            "price": Decimal("1.50"),
+            "text": "caf\u00e9 \u2028",
+            "nested": [{"is_active": True, "count": 3, "missing": None}],
+            1: "integer key",
+        }
+
+        self.assertEqual(OrjsonRenderer().render(data), JSONRenderer().render(data))
+
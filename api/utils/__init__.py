@@ -1,4 +1,5 @@
-from .result import Result
+from .result import Result, ErrorCode
 from .password_utils import PasswordUtils
+from .jwt_cache import JWTCache, VerifiedToken
 
-__all__ = ["Result", "PasswordUtils"]
\ No newline at end of file
+__all__ = ["Result", "ErrorCode", "PasswordUtils", "JWTCache", "VerifiedToken"]
\ No newline at end of file
@@ -0,0 +1,53 @@
+import logging
+import statistics
+import time
+
+import argon2
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+logger = logging.getLogger(__name__)
+
+class CalibratedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    CalibratedArgon2PasswordHasher is an Argon2 hasher whose time cost comes from the ARGON2_TIME_COST setting,
+    measured once per machine with `manage.py calibrate_argon2`.
+    It keeps Django's "argon2" algorithm name, so the hashes stay readable by the stock hasher.
+    """
+
+    # OWASP's Argon2id profile: 46 MiB of memory, one lane, and a time cost of 1 unless ARGON2_TIME_COST raises it.
+    # Django's default (100 MiB over 8 lanes) spreads each hash across threads that concurrent requests need themselves.
+    default_time_cost = 1
+    memory_cost = 46 * 1024
+    parallelism = 1
+
+    max_time_cost = 16
+    calibration_samples = 3
+
+    @property
+    def time_cost(self) -> int:
+        return getattr(settings, "ARGON2_TIME_COST", 0) or self.default_time_cost
+
+    @classmethod
+    def calibrate(cls, target_ms: int) -> int:
+        """Return the lowest time cost whose median hashing time reaches the target on this machine."""
+        target = target_ms / 1000
+
+        for time_cost in range(1, cls.max_time_cost + 1):
+            hasher = argon2.PasswordHasher(
+                time_cost=time_cost,
+                memory_cost=cls.memory_cost,
+                parallelism=cls.parallelism,
+            )
+            samples = []
+            for _ in range(cls.calibration_samples):
+                start = time.perf_counter()
+                hasher.hash("calibration")
+                samples.append(time.perf_counter() - start)
+
+            elapsed = statistics.median(samples)
+            if elapsed >= target:
+                break
+
+        logger.info("Argon2 time cost calibrated to %s (%.0f ms per hash)", time_cost, elapsed * 1000)
+        return time_cost
@@ -0,0 +1,73 @@
+import hashlib
+import time
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Type
+
+from cachetools import TLRUCache
+
+if TYPE_CHECKING:
+    from rest_framework_simplejwt.tokens import Token
+
+# Upper bound (in seconds) for how long a verified token is trusted without re-checking its signature.
+CACHE_TTL = 60
+CACHE_MAXSIZE = 10000
+
+
+class VerifiedToken:
+    """
+    VerifiedToken is a lightweight stand-in for a simplejwt token that has already been verified.
+    It exposes the decoded payload and converts back to the original encoded string.
+    """
+
+    __slots__ = ("token", "payload")
+
+    def __init__(self, token: str, payload: dict[str, Any]):
+        self.token = token
+        self.payload = payload
+
+    def __getitem__(self, key: str) -> Any:
+        return self.payload[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.payload.get(key, default)
+
+    def __str__(self) -> str:
+        """Return the encoded token."""
+        return self.token
+
+    def __repr__(self) -> str:
+        return repr(self.payload)
+
+
+def expires_at(key: tuple, token: VerifiedToken, now: float) -> float:
+    """Keep an entry for CACHE_TTL seconds at most, and never past the token expiration."""
+    return min(now + CACHE_TTL, token.payload.get("exp", now))
+
+
+class JWTCache:
+    """
+    JWTCache keeps recently verified JWTs in memory, keyed by the SHA-256 of the encoded token.
+    Requests carrying the same token skip the signature verification and payload decoding.
+    """
+
+    _cache: TLRUCache = TLRUCache(maxsize=CACHE_MAXSIZE, ttu=expires_at, timer=time.time)
+    _lock = Lock()
+
+    @classmethod
+    def verify(cls, token_class: Type["Token"], token_str: str) -> VerifiedToken:
+        """
+        Verify a token with the given token class, using the cache when possible.
+        Raises TokenError if the token is invalid, like the token class itself.
+        """
+        key = (token_class, hashlib.sha256(token_str.encode()).digest())
+        with cls._lock:
+            verified = cls._cache.get(key)
+        if verified is not None:
+            return verified
+
+        token_obj = token_class(token_str)
+        verified = VerifiedToken(token_str, token_obj.payload)
+        with cls._lock:
+            cls._cache[key] = verified
+        return verified
+
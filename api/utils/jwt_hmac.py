@@ -0,0 +1,42 @@
+import hmac
+
+import jwt
+from jwt.algorithms import HMACAlgorithm
+from jwt.utils import force_bytes
+
+class PrekeyedHMACAlgorithm(HMACAlgorithm):
+    """
+    PrekeyedHMACAlgorithm is a PyJWT HMAC algorithm that keys its HMAC state once per secret.
+    Each signature copies the keyed state, instead of re-checking and re-keying the secret on every call.
+    """
+
+    def __init__(self, hash_alg):
+        super().__init__(hash_alg)
+        self._keyed: dict[bytes, hmac.HMAC] = {}
+
+    def prepare_key(self, key: str | bytes) -> bytes:
+        key_bytes = force_bytes(key)
+        if key_bytes not in self._keyed:
+            # Rejects asymmetric keys, only once per secret
+            super().prepare_key(key_bytes)
+            self._keyed[key_bytes] = hmac.new(key_bytes, digestmod=self.hash_alg)
+        return key_bytes
+
+    def sign(self, msg: bytes, key: bytes) -> bytes:
+        keyed = self._keyed.get(key)
+        if keyed is None:
+            keyed = self._keyed[self.prepare_key(key)]
+        mac = keyed.copy()
+        mac.update(msg)
+        return mac.digest()
+
+
+def install_prekeyed_hmac() -> None:
+    """Replace PyJWT's HS256/HS384/HS512 algorithms, used by simplejwt, with their pre-keyed version."""
+    for name, hash_alg in (
+        ("HS256", HMACAlgorithm.SHA256),
+        ("HS384", HMACAlgorithm.SHA384),
+        ("HS512", HMACAlgorithm.SHA512),
+    ):
+        jwt.unregister_algorithm(name)
+        jwt.register_algorithm(name, PrekeyedHMACAlgorithm(hash_alg))
@@ -1,47 +1,110 @@
 import os
+import threading
 from django.contrib.auth.hashers import make_password, check_password
 
+# Argon2 releases the GIL, so concurrent requests already hash in parallel on their own threads.
+# Cap the concurrent hashes to the CPU count: each one holds its memory cost, and extra ones would only compete for the cores.
+_HASHING_SLOTS = threading.BoundedSemaphore(os.cpu_count() or 1)
+
+# Read once, the environment is loaded by the settings before the app is imported
+_PEPPER = os.environ.get("PASSWORD_PEPPER", "")
+
+# Character classes checked by is_password_strong, one bit each
+_DIGIT = 1
+_UPPER = 2
+_LOWER = 4
+_SPECIAL = 8
+_ALL_CLASSES = _DIGIT | _UPPER | _LOWER | _SPECIAL
+
+_SPECIAL_CHARACTERS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+
+def _build_char_classes() -> bytes:
+    """Build the table of character class bits for every byte value, only ASCII bytes have any."""
+    table = bytearray(256)
+    for code in range(128):
+        char = chr(code)
+        if char.isdigit():
+            table[code] |= _DIGIT
+        if char.isupper():
+            table[code] |= _UPPER
+        if char.islower():
+            table[code] |= _LOWER
+        if char in _SPECIAL_CHARACTERS:
+            table[code] |= _SPECIAL
+    return bytes(table)
+
+_CHAR_CLASSES = _build_char_classes()
+
+def _char_classes(plain_password: str) -> int:
+    """Return the bits of the character classes found in the password."""
+    # One pass over the bytes with a table lookup each, instead of one pass per rule
+    mask = 0
+    for byte in plain_password.encode("utf-8", "ignore"):
+        mask |= _CHAR_CLASSES[byte]
+        if mask == _ALL_CLASSES:
+            return mask
+    
+    # Non-ASCII digits and letters count too, the table only knows ASCII
+    if not plain_password.isascii():
+        for char in plain_password:
+            if char.isdigit():
+                mask |= _DIGIT
+            elif char.isupper():
+                mask |= _UPPER
+            elif char.islower():
+                mask |= _LOWER
+    return mask
+
 class PasswordUtils:
     """
     PasswordUtils is a class that provides utility functions for password operations.
     """
 
     @classmethod
-    def _get_pepper(cls) -> str:
-        """Get the pepper from the environment variables."""
-        return os.environ.get("PASSWORD_PEPPER", "")
+    def reload_pepper(cls) -> None:
+        """Read the pepper from the environment variables again, e.g. after a test changed it."""
+        global _PEPPER
+        _PEPPER = os.environ.get("PASSWORD_PEPPER", "")
     
     @classmethod
     def hash_password(cls, plain_password:str) -> str:
         """Hash a plain password using the pepper."""
-        peppered_plain_password = f"{plain_password}{cls._get_pepper()}"
-        hashed_password = make_password(peppered_plain_password)
+        peppered_plain_password = plain_password + _PEPPER
+        with _HASHING_SLOTS:
+            hashed_password = make_password(peppered_plain_password)
         return hashed_password
     
     @classmethod
     def verify_password(cls, plain_password:str, hashed_password:str) -> bool:
         """Verify a plain password against a hashed password."""
-        peppered_plain_password = f"{plain_password}{cls._get_pepper()}"
-        return check_password(peppered_plain_password, hashed_password)
+        peppered_plain_password = plain_password + _PEPPER
+        with _HASHING_SLOTS:
+            return check_password(peppered_plain_password, hashed_password)
+    
+    @classmethod
+    def is_password_strong_fast(cls, plain_password:str) -> bool:
+        """Check if a password is strong, without building the error messages."""
+        return len(plain_password) >= 8 and _char_classes(plain_password) == _ALL_CLASSES
     
     @classmethod
     def is_password_strong(cls, plain_password:str) -> tuple[bool, list[str]]:
         """Check if a password is strong."""
+        mask = _char_classes(plain_password)
         errors = []
 
         if len(plain_password) < 8 :
             errors.append("Password must be at least 8 characters long")
         
-        if not any(char.isdigit() for char in plain_password):
+        if not mask & _DIGIT:
             errors.append("Password must contain at least one digit")
         
-        if not any(char.isupper() for char in plain_password):
+        if not mask & _UPPER:
             errors.append("Password must contain at least one uppercase letter")
         
-        if not any(char.islower() for char in plain_password):
+        if not mask & _LOWER:
             errors.append("Password must contain at least one lowercase letter")
         
-        if not any(c in "!@#$%^&*()_+-=[]{}|;:,.<>?" for c in plain_password):
+        if not mask & _SPECIAL:
             errors.append("La password deve contenere almeno un carattere speciale")
         
         return len(errors) == 0, errors
\ No newline at end of file
@@ -0,0 +1,20 @@
+from typing import Any
+
+import orjson
+from django.core.serializers.json import DjangoJSONEncoder
+from django_redis.serializers.base import BaseSerializer
+
+class OrjsonSerializer(BaseSerializer):
+    """
+    OrjsonSerializer is a django-redis serializer backed by orjson.
+    It reads the payloads written by the JSON serializer, and falls back to DjangoJSONEncoder
+    for the values orjson can't encode natively (Decimal, lazy translations, ...).
+    """
+
+    _encode_fallback = DjangoJSONEncoder().default
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=self._encode_fallback)
+
+    def loads(self, value: bytes) -> Any:
+        return orjson.loads(value)
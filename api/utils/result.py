@@ -1,17 +1,39 @@
+from enum import Enum
 from typing import TypeVar, Generic, Optional
 
 T = TypeVar("T")
 
+class ErrorCode(Enum):
+    """Machine-readable reasons attached to error results, for callers that react to a specific failure."""
+
+    REVOKED = "revoked"
+
+class _ErrorField:
+    """
+    Resolves `error` to the error message on a Result instance, and to the error constructor on the class.
+    Needed because a slot can't share its name with the `error` classmethod.
+    """
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return owner._new_error
+        return instance._error
+
 class Result(Generic[T]):
     """
     Result is a generic class that represents the result of an operation.
     Used for handling success and error cases in a functional way.
     """
 
-    def __init__(self, data: Optional[T] = None, error: Optional[str] = None):
+    __slots__ = ("data", "_error", "is_success", "code")
+
+    error = _ErrorField()
+
+    def __init__(self, data: Optional[T] = None, error: Optional[str] = None, code: Optional[ErrorCode] = None):
         self.data = data
-        self.error = error
+        self._error = error
         self.is_success = error is None
+        self.code = code
     
     @classmethod
     def success(cls, data: T) -> "Result[T]":
@@ -19,14 +41,20 @@ class Result(Generic[T]):
         return cls(data)
     
     @classmethod
-    def error(cls, error: str) -> "Result[T]":
-        """Create an error result with the given error message."""
-        return cls(error=error)
+    def _new_error(cls, error: str, code: Optional[ErrorCode] = None) -> "Result[T]":
+        """Create an error result with the given error message and optional error code."""
+        if cls is Result:
+            shared = _COMMON_ERRORS.get(error)
+            if shared is not None and shared.code is code:
+                return shared
+        return cls(error=error, code=code)
     
+    # deprecated: use .data
     def get_data(self) -> Optional[T]:
         """Get the data from the result."""
         return self.data
     
+    # deprecated: use .error
     def get_error(self) -> Optional[str]:
         """Get the error from the result."""
         return self.error
@@ -39,4 +67,18 @@ class Result(Generic[T]):
         """Return a string representation of the result."""
         if self.is_success:
             return f"Success(data={self.data})"
-        return f"Error(error={self.error})"
\ No newline at end of file
+        return f"Error(error={self.error})"
+
+# Error results carry no other state, the ones with a fixed message are allocated once and shared
+_COMMON_ERRORS: dict[str, Result] = {
+    message: Result(error=message, code=code)
+    for message, code in (
+        ("User not found", None),
+        ("Invalid refresh token", None),
+        ("Invalid token format", None),
+        ("Refresh token has been revoked", ErrorCode.REVOKED),
+        ("Refresh token already blacklisted", None),
+        ("Access and refresh token do not belong to the same user", None),
+        ("Failed to create user", None),
+    )
+}
@@ -1,106 +1,122 @@
-from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 
-from api.decorators import service_injector, serializer_injector, extract_refresh_token, route_protector
+from api.decorators import protected_view
 from api.services import UserService
 from api.serializers import UserSerializer, LoginSerializer, UpdateSerializer
+from api.utils import ErrorCode
 
-@api_view(["GET"])
-@service_injector(UserService)
-@serializer_injector(UserSerializer, many=True)
+USER_LIST_MAX_PAGE_SIZE = 100
+
+def _user_list_etag(request, service) -> str | None:
+    """
+    Tag a page with the user list version and the negotiated format, so the JSON and browsable API renderings differ.
+    Every page shares the version, the client's cache tells the pages apart by URL.
+    """
+    result = service.get_user_list_version()
+    if not result.is_success:
+        return None
+    return quote_etag(f"{result.data}-{request.accepted_renderer.format}")
+
+@protected_view(["GET"], UserService, serializer_class=UserSerializer, many=True)
 def user_list(request, service, serializer):
-    result = service.get_user_list()
+    try:
+        limit = int(request.query_params.get("limit", api_settings.PAGE_SIZE))
+        offset = int(request.query_params.get("offset", 0))
+    except ValueError:
+        return Response("Invalid pagination parameters", status=HTTP_400_BAD_REQUEST)
+
+    if limit < 1 or offset < 0:
+        return Response("Invalid pagination parameters", status=HTTP_400_BAD_REQUEST)
+
+    # Checked before the query, an unchanged list costs neither the SELECT nor the serialization
+    etag = _user_list_etag(request, service)
+    if etag is not None:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified.headers["ETag"] = etag
+            return not_modified
+
+    result = service.get_user_list(min(limit, USER_LIST_MAX_PAGE_SIZE), offset)
     if not result.is_success:
-        return Response(result.get_error(), status=status.HTTP_400_BAD_REQUEST)
+        return Response(result.error, status=HTTP_400_BAD_REQUEST)
     
-    user_list = result.get_data()
+    user_list = result.data
     serializer_data = serializer.to_representation(user_list)
-    return Response(serializer_data, status=status.HTTP_200_OK)
+    # DRF already adds "Vary: Accept", the representation depends on the negotiated renderer
+    headers = {"ETag": etag} if etag is not None else None
+    return Response(serializer_data, status=HTTP_200_OK, headers=headers)
     
-@api_view(["POST"])
-@service_injector(UserService)
-@serializer_injector(UserSerializer)
+@protected_view(["POST"], UserService, serializer_class=UserSerializer)
 def account_create(request, service, serializer):
     validated_data = serializer.validated_data
     result = service.account_create(validated_data)
     if not result.is_success:
-        return Response(result.get_error(), status=status.HTTP_400_BAD_REQUEST)
+        return Response(result.error, status=HTTP_400_BAD_REQUEST)
     
-    new_user = result.get_data()
+    new_user = result.data
     response_serializer = serializer.to_representation(new_user)
-    return Response(response_serializer, status=status.HTTP_201_CREATED)
+    return Response(response_serializer, status=HTTP_201_CREATED)
 
-@api_view(["POST"])
-@service_injector(UserService)
-@serializer_injector(LoginSerializer)
+@protected_view(["POST"], UserService, serializer_class=LoginSerializer)
 def login(request, service, serializer):
     validated_data = serializer.validated_data
     result = service.login(validated_data)
 
     if not result.is_success:
-        return Response(result.get_error(), status=status.HTTP_400_BAD_REQUEST)
+        return Response(result.error, status=HTTP_400_BAD_REQUEST)
 
-    login_data = result.get_data()
+    login_data = result.data
 
     return Response({
         "message" : "Login successful",
         "access_token" : login_data["access_token"],
         "refresh_token" : login_data["refresh_token"],
         "user" : login_data["user"],
-    }, status=status.HTTP_200_OK)
+    }, status=HTTP_200_OK)
 
-@api_view(["POST"])
-@service_injector(UserService)
-@route_protector()
-@extract_refresh_token()
+@protected_view(["POST"], UserService, authenticated=True, refresh_token=True)
 def refresh_token(request, service, refresh_token):
     
     result = service.refresh_token(refresh_token)
     if not result.is_success:
-        error_message = result.get_error()
-        
         # If the token is revoked, return 401 instead of 400
-        if "revoked" in error_message.lower():
-            return Response({"message": error_message}, status=status.HTTP_401_UNAUTHORIZED)
+        if result.code is ErrorCode.REVOKED:
+            return Response({"message": result.error}, status=HTTP_401_UNAUTHORIZED)
         
-        return Response({"message": error_message}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"message": result.error}, status=HTTP_400_BAD_REQUEST)
     
-    token_data = result.get_data()
-    return Response({
-        **token_data,
-        "status" : status.HTTP_200_OK,
-    })
-
-@api_view(["POST"])
-@service_injector(UserService)
-@route_protector(True)
-@extract_refresh_token()
+    return Response(result.data, status=HTTP_200_OK)
+
+@protected_view(["POST"], UserService, pass_access_token=True, refresh_token=True)
 def logout(request, service, access_token, refresh_token):
 
     result = service.logout(refresh_token, access_token)
     if not result.is_success:
         return Response(
-            {"message": result.get_error()}, 
-            status=status.HTTP_400_BAD_REQUEST
+            {"message": result.error}, 
+            status=HTTP_400_BAD_REQUEST
         )
     
-    return Response({"message": "Logout successful"}, status=status.HTTP_200_OK)
+    return Response({"message": "Logout successful"}, status=HTTP_200_OK)
+
+def _get_current_user(request, service):
+    """Load the user of the request's access token, the instance validated by UpdateSerializer."""
+    return service.repo.get_by_id(request.user_id)
 
-@api_view(["PUT"])
-@service_injector(UserService)
-@route_protector(True)
-@serializer_injector(UpdateSerializer, instance= lambda request, service, access_token : service.repo.get_by_id(access_token.payload.get("user_id")))
-def update_user(request, service, access_token, serializer):
+@protected_view(["PUT"], UserService, serializer_class=UpdateSerializer, authenticated=True, instance=_get_current_user)
+def update_user(request, service, serializer):
     validated_data = serializer.validated_data
-    user_id = access_token.payload.get("user_id")
 
-    result = service.update_user(validated_data, user_id)
+    result = service.update_user(validated_data, request.user_id)
     if not result.is_success:
-        return Response(result.get_error(), status=status.HTTP_400_BAD_REQUEST)
+        return Response(result.error, status=HTTP_400_BAD_REQUEST)
     
-    return Response({"message": "User updated successfully"}, status=status.HTTP_200_OK)
+    return Response({"message": "User updated successfully"}, status=HTTP_200_OK)
 
 
 